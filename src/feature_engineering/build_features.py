@@ -15,8 +15,14 @@ Output format:
     data/processed/country=XX/year=YYYY/load_forecasting_features.parquet
 """
 
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import holidays
 from typing import List
 
@@ -32,6 +38,41 @@ FEATURED_BASE_PATH = PROJECT_ROOT / "data" / "featured"
 # Core feature engineering logic (extracted for unit testing)
 # ---------------------------------------------------------------------
 
+@lru_cache(maxsize=None)
+def _holiday_days(country: str, first_year: int, last_year: int) -> np.ndarray:
+    """
+    Sorted holidays of country over [first_year, last_year], as int64 days
+    since epoch. Cached: the holiday rule set is only evaluated once per range.
+    """
+    country_holidays = holidays.country_holidays(country, years=list(range(first_year, last_year + 1)))
+    days = np.array(sorted(country_holidays), dtype="datetime64[D]").astype(np.int64)
+    # Shared between calls: must not be modified in place
+    days.flags.writeable = False
+    return days
+
+
+def _shifted_block(df: pd.DataFrame, shifts: dict[str, tuple[str, int]]) -> pd.DataFrame:
+    """
+    Equivalent of df[col].shift(k) for every {name: (col, k)} in shifts,
+    written into a single pre-allocated block (NaN where undefined).
+    The block keeps the source precision (float32 for stored data).
+    """
+    cols = {col for col, _ in shifts.values()}
+    dtype = np.result_type(np.float32, *(df[col].dtype for col in cols))
+    out = np.full((len(df), len(shifts)), np.nan, dtype=dtype)
+
+    for j, (col, k) in enumerate(shifts.values()):
+        values = df[col].to_numpy(dtype=dtype)
+        if k > 0:
+            out[k:, j] = values[:-k]
+        elif k < 0:
+            out[:k, j] = values[-k:]
+        else:
+            out[:, j] = values
+
+    return pd.DataFrame(out, columns=list(shifts), index=df.index)
+
+
 def _compute_features(df: pd.DataFrame, country: str, forecast_horizon: int = 1) -> pd.DataFrame:
     """
     Pure feature engineering logic, without input/output.
@@ -39,30 +80,63 @@ def _compute_features(df: pd.DataFrame, country: str, forecast_horizon: int = 1)
     """
     df = df.copy().sort_values("datetime").reset_index(drop=True)
 
-    # Target variable (h+1)
-    df[f"target_load_t+{forecast_horizon}"] = df["load_MW"].shift(-forecast_horizon)
+    # Calendar features (UTC), all derived from one int64 buffer of
+    # hours since epoch (1970-01-01 was a Thursday)
+    hours = df["datetime"].dt.tz_convert(None).to_numpy().astype("datetime64[h]").astype(np.int64)
+    days = hours // 24
+    day_of_week = (days + 3) % 7  # Monday=0
+
+    # ISO week: the Thursday of the week gives the ISO year, weeks are
+    # counted from January 1st of that year
+    thursdays = days - day_of_week + 3
+    iso_year_start = (
+        thursdays.astype("datetime64[D]").astype("datetime64[Y]")
+        .astype("datetime64[D]").astype(np.int64)
+    )
+    iso_week = (thursdays - iso_year_start) // 7 + 1
 
-    # Calendar features
-    df["hour"] = df["datetime"].dt.hour
-    df["day_of_week"] = df["datetime"].dt.dayofweek
-    df["is_weekday"] = (df["day_of_week"] < 5).astype(int)
-    df["week_of_year"] = df["datetime"].dt.isocalendar().week.astype(int)
-    # Replace ISO week 53 by 52 for consistency
-    df.loc[df["week_of_year"] == 53, "week_of_year"] = 52
+    calendar = pd.DataFrame({
+        "hour":         (hours % 24).astype(np.int8),
+        "day_of_week":  day_of_week.astype(np.int8),
+        "is_weekday":   (day_of_week < 5).astype(np.int8),
+        # Replace ISO week 53 by 52 for consistency
+        "week_of_year": np.minimum(iso_week, 52).astype(np.int8),
+    }, index=df.index)
+    df = pd.concat([df, calendar], axis=1)
 
     # Holidays (treated as non-working days)
-    country_holidays = holidays.country_holidays(country)
-    df["is_holiday"] = df["datetime"].dt.tz_convert("Europe/Paris").apply(
-        lambda x: 1 if x.date() in country_holidays else 0
+    # Local days (int64 days since epoch) are looked up in a 0/1 table
+    # covering the whole day range, built from the holidays of the covered years
+    local_days = (
+        df["datetime"].dt.tz_convert("Europe/Paris").dt.tz_localize(None)
+        .to_numpy().astype("datetime64[D]").astype(np.int64)
     )
-    # Holidays override weekday flag
-    df.loc[df["is_holiday"] == 1, "is_weekday"] = 0
+    first_day, last_day = (local_days.min(), local_days.max()) if len(local_days) else (0, -1)
+    n_days = last_day - first_day + 1
 
-    # Lag features
-    df["load_t-1"]        = df["load_MW"].shift(1)
-    df["load_t-24"]       = df["load_MW"].shift(24)
-    df["load_t-168"]      = df["load_MW"].shift(24 * 7)
-    df["temperature_t-24"] = df["temperature_2m"].shift(24)
+    first_year, last_year = (
+        np.array([first_day, last_day], dtype="datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+    )
+    holiday_days = _holiday_days(country, int(first_year), int(last_year)) - first_day
+    holiday_days = holiday_days[(holiday_days >= 0) & (holiday_days < n_days)]
+
+    is_holiday_day = np.zeros(n_days, dtype=np.int8)
+    is_holiday_day[holiday_days] = 1
+    df["is_holiday"] = is_holiday_day[local_days - first_day]
+    # Holidays override weekday flag
+    df["is_weekday"] = np.where(
+        df["is_holiday"].to_numpy() == 1, 0, df["is_weekday"].to_numpy()
+    ).astype(np.int8)
+
+    # Target variable (h+1) and lag features, added as one contiguous block
+    shifts = {
+        f"target_load_t+{forecast_horizon}": ("load_MW", -forecast_horizon),
+        "load_t-1":         ("load_MW", 1),
+        "load_t-24":        ("load_MW", 24),
+        "load_t-168":       ("load_MW", 24 * 7),
+        "temperature_t-24": ("temperature_2m", 24),
+    }
+    df = pd.concat([df, _shifted_block(df, shifts)], axis=1)
 
     df = df.rename(columns={"load_MW": "load_t", "temperature_2m": "temperature_t"})
 
@@ -93,40 +167,34 @@ def build_load_forecasting_features(
     # ------------------------------------------------------------
     # Load multi-year preprocessed data
     # ------------------------------------------------------------
-    dfs = []
-
-    for year in years:
-        path = (
-            PROCESSED_BASE_PATH
-            / f"country={country}"
-            / f"year={year}"
-            / "load_weather.parquet"
-        )
-        if not path.exists():
-            continue
+    country_path = PROCESSED_BASE_PATH / f"country={country}"
+    if not country_path.exists():
+        raise ValueError("No preprocessed data found for the given years")
 
-        df_year = pd.read_parquet(path)
+    # Previous years are read only to bootstrap lag context
+    context_years = sorted({year - 1 for year in years} - set(years))
 
-        # Bootstrap lag context from previous year if available
-        prev_path = (
-            PROCESSED_BASE_PATH
-            / f"country={country}"
-            / f"year={year - 1}"
-            / "load_weather.parquet"
-        )
-        if prev_path.exists():
-            df_prev = pd.read_parquet(prev_path)
-            cutoff = df_prev["datetime"].max() - pd.Timedelta(hours=168)
-            df_context = df_prev[df_prev["datetime"] > cutoff]
-            df_year = pd.concat([df_context, df_year], ignore_index=True)
+    # Single scan over the year=YYYY partitions (int64, as stored in the files)
+    dataset = ds.dataset(
+        country_path,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("year", pa.int64())]), flavor="hive"),
+    )
+    table = dataset.to_table(filter=ds.field("year").isin(list(years) + context_years))
 
-        dfs.append(df_year)
+    df = table.to_pandas(self_destruct=True, split_blocks=True)
 
-    if not dfs:
+    if not df["year"].isin(years).any():
         raise ValueError("No preprocessed data found for the given years")
 
+    # Bootstrap lag context: keep only the last 168h of each previous year
+    is_context = df["year"].isin(context_years)
+    cutoff = (
+        df["datetime"].where(is_context).groupby(df["year"]).transform("max")
+        - pd.Timedelta(hours=168)
+    )
     df = (
-        pd.concat(dfs, ignore_index=True)
+        df[~is_context | (df["datetime"] > cutoff)]
           .sort_values("datetime")
           .reset_index(drop=True)
     )
@@ -156,7 +224,7 @@ def build_load_forecasting_features(
     target_col = f"target_load_t+{forecast_horizon}"
 
     # Final dataset for modeling
-    df_model = df[feature_cols + [target_col]].dropna().copy()
+    df_model = df[feature_cols + [target_col]].dropna()
 
     # ------------------------------------------------------------
     # Final sanity checks
@@ -170,7 +238,13 @@ def build_load_forecasting_features(
     # ------------------------------------------------------------
     # Save features partitioned by year
     # ------------------------------------------------------------
-    for year, df_year in df_model.groupby(df_model["datetime"].dt.year):
+    # Converted to Arrow once; each year is a filtered slice of the same table
+    table = pa.Table.from_pandas(df_model, preserve_index=False)
+    row_years = pc.year(table["datetime"])
+
+    current_year = pd.Timestamp.now().year
+
+    for year in pc.unique(row_years).to_pylist():
 
         output_dir = (
             FEATURED_BASE_PATH
@@ -181,8 +255,6 @@ def build_load_forecasting_features(
 
         output_path = output_dir / "load_forecasting_features.parquet"
 
-        current_year = pd.Timestamp.now().year
-
         if output_path.exists() and year < current_year:
             print(f"[SKIP] {output_path}")
             continue
@@ -190,9 +262,11 @@ def build_load_forecasting_features(
         if output_path.exists() and year == current_year:
             print(f"[FETCH] {output_path} exists but year={year} is current year - refreshing")
 
-        df_year.to_parquet(output_path, index=False)
+        table_year = table.filter(pc.equal(row_years, year))
+
+        pq.write_table(table_year, output_path)
 
-        print(f"[SAVED] {output_path} | rows={len(df_year)}")
+        print(f"[SAVED] {output_path} | rows={table_year.num_rows}")
 
 
 # ---------------------------------------------------------------------
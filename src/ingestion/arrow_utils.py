@@ -0,0 +1,38 @@
+"""
+Arrow Helpers for Ingestion
+---------------------------
+
+Small pyarrow helpers shared by the ingestion writers.
+"""
+
+import numpy as np
+import pyarrow as pa
+
+
+def append_country_column(table: pa.Table, country: str) -> pa.Table:
+    """
+    Append a constant country column to a table.
+
+    The value is the same on every row of a file, so it is stored as a
+    one-entry dictionary (all-zero int32 indices).
+
+    Parameters
+    ----------
+    table : pa.Table
+        Table to extend
+    country : str
+        Country code (e.g. "FR")
+
+    Returns
+    -------
+    pa.Table
+        The table with a trailing dictionary-encoded "country" column
+    """
+
+    return table.append_column(
+        "country",
+        pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(table.num_rows, dtype=np.int32)),
+            pa.array([country])
+        )
+    )
@@ -0,0 +1,142 @@
+"""
+ENTSO-E XML Parsing
+-------------------
+
+Parse ENTSO-E Actual Total Load documents into numpy arrays or a
+DataFrame. Shared by the historical and real-time ingestion scripts;
+depends only on lxml, numpy and pandas (no HTTP client).
+"""
+
+import io
+import re
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+
+# ENTSO-E load document namespace and the tag streamed by the parser
+ENTSOE_NS = "urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0"
+NS_MAP = {"ns": ENTSOE_NS}
+PERIOD_TAG = f"{{{ENTSOE_NS}}}Period"
+
+
+class EntsoeNoDataError(ValueError):
+    """
+    Raised when an ENTSO-E document holds no <Period>, i.e. no data has
+    been published for the requested window.
+    """
+
+
+# ---------------------------------------------------------------------
+# Parse an ENTSO-E load document
+# ---------------------------------------------------------------------
+def _resolution_minutes(resolution: str | None) -> int:
+    """
+    Convert a Period resolution (ISO 8601 duration such as PT15M or PT60M)
+    to minutes. Periods without a resolution are hourly.
+    """
+
+    if resolution is None:
+        return 60
+
+    match = re.fullmatch(r"PT(?:(\d+)H)?(?:(\d+)M)?", resolution.strip())
+    if match is None or not any(match.groups()):
+        raise ValueError(f"Unsupported ENTSO-E resolution: {resolution}")
+
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def parse_entsoe_load_points(content: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parse an ENTSO-E Actual Total Load XML document into numpy arrays.
+
+    The document is streamed with lxml.iterparse one <Period> at a time.
+    Each Period is converted to numpy arrays (positions and quantities),
+    then the element is cleared. Gap-free Periods skip position parsing.
+    Timestamps for all Periods are computed in a single vectorised
+    operation at the end, from each Period's start and resolution.
+
+    Returns
+    -------
+    tuple of numpy arrays:
+    - timestamps (datetime64[us], UTC)
+    - quantities (float64, MW)
+    """
+
+    period_starts = []
+    period_steps = []
+    period_positions = []
+    period_quantities = []
+
+    for _, period in etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag=PERIOD_TAG,
+        huge_tree=True
+    ):
+        period_starts.append(
+            period.findtext("ns:timeInterval/ns:start", namespaces=NS_MAP).rstrip("Z")
+        )
+        period_steps.append(
+            _resolution_minutes(period.findtext("ns:resolution", namespaces=NS_MAP))
+        )
+
+        points = period.findall("ns:Point", namespaces=NS_MAP)
+        n = len(points)
+
+        quantities = np.fromiter(
+            (float(point.findtext("ns:quantity", namespaces=NS_MAP)) for point in points),
+            dtype=np.float64,
+            count=n
+        )
+
+        # Positions are strictly increasing: if they run from 1 to n there is
+        # no gap (the usual case) and they do not need to be parsed one by one
+        if n and (
+            int(points[0].findtext("ns:position", namespaces=NS_MAP)) == 1
+            and int(points[-1].findtext("ns:position", namespaces=NS_MAP)) == n
+        ):
+            positions = np.arange(1, n + 1, dtype=np.int32)
+        else:
+            positions = np.fromiter(
+                (int(point.findtext("ns:position", namespaces=NS_MAP)) for point in points),
+                dtype=np.int32,
+                count=n
+            )
+
+        period_positions.append(positions)
+        period_quantities.append(quantities)
+
+        period.clear()
+
+    if not period_starts:
+        raise EntsoeNoDataError("No <Period> nodes found in ENTSO-E response")
+
+    # start of each point's Period + (position - 1) * resolution
+    counts = [len(positions) for positions in period_positions]
+    starts = np.repeat(np.array(period_starts, dtype="datetime64[us]"), counts)
+    steps = np.repeat(np.array(period_steps, dtype=np.int64), counts)
+    offsets = (np.concatenate(period_positions) - 1) * steps
+    timestamps = starts + offsets.astype("timedelta64[m]")
+
+    return timestamps, np.concatenate(period_quantities)
+
+
+def parse_entsoe_load_xml(content: bytes) -> pd.DataFrame:
+    """
+    Parse an ENTSO-E Actual Total Load XML document.
+
+    Returns
+    -------
+    pd.DataFrame with columns:
+    - datetime (UTC)
+    - load_MW
+    """
+
+    timestamps, quantities = parse_entsoe_load_points(content)
+
+    return pd.DataFrame({
+        "datetime": pd.DatetimeIndex(timestamps).tz_localize("UTC"),
+        "load_MW": quantities
+    })
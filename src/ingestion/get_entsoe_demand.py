@@ -9,18 +9,25 @@ Output directory (always, regardless of where the script is run):
 data/raw/electricity_demand/country=XX/year=YYYY/demand.parquet
 
 Existing files are always overwritten (for the moment).
+
+Yearly requests are independent, so they are issued concurrently on a
+single aiohttp session (bounded by MAX_CONCURRENT_REQUESTS).
 """
 
 from pathlib import Path
-import time
-import random
-import requests
-import pandas as pd
-import xml.etree.ElementTree as ET
-from datetime import datetime
+import asyncio
+import aiohttp
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
 
+from src.ingestion.arrow_utils import append_country_column
+from src.ingestion.entsoe_xml import parse_entsoe_load_points
+
 
 # ---------------------------------------------------------------------
 # Project paths 
@@ -31,23 +38,38 @@ DATA_RAW_PATH = PROJECT_ROOT / "data" / "raw" / "electricity_demand"
 
 BASE_URL = "https://web-api.tp.entsoe.eu/api"
 
+# Yearly requests in flight at once (ENTSO-E allows 400 requests/min per token)
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT_S = 30
+KEEPALIVE_TIMEOUT_S = 30
+
+# On-disk response cache, shared by every run whatever the working directory:
+# past years are final, the current year is still published
+CACHE_PATH = PROJECT_ROOT / ".cache" / "entsoe"
+PAST_YEAR_EXPIRE_S = 86400
+CURRENT_YEAR_EXPIRE_S = 900
+
 
 # ---------------------------------------------------------------------
 # Fetch one full year of demand
 # ---------------------------------------------------------------------
-def fetch_entsoe_demand_one_year(
+async def fetch_entsoe_demand_one_year(
+    session: aiohttp.ClientSession,
     year: int,
     country_code: str,
     api_token: str
-) -> pd.DataFrame:
+) -> pa.Table:
     """
     Fetch hourly actual electricity demand for one full year from ENTSO-E.
 
+    The response is processed with numpy and returned as an Arrow table,
+    ready to be written, without going through pandas.
+
     Returns
     -------
-    pd.DataFrame with columns:
+    pa.Table with columns:
     - datetime (UTC)
-    - load_MW
+    - load_MW (float32)
     """
 
     period_start = f"{year}01010000"
@@ -62,77 +84,146 @@ def fetch_entsoe_demand_one_year(
         "securityToken": api_token
     }
 
-    response = requests.get(BASE_URL, params=params, timeout=30)
-    response.raise_for_status()
-
-    root = ET.fromstring(response.content)
-
-    ns = {
-        "ns": "urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0"
-    }
-
-    period_nodes = root.findall(".//ns:Period", ns)
-    if not period_nodes:
-        raise ValueError("No <Period> nodes found in ENTSO-E response")
-
-    records = []
-
-    for period in period_nodes:
-        start_time = period.find("ns:timeInterval/ns:start", ns).text
-        start_time = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-
-        for point in period.findall("ns:Point", ns):
-            position = int(point.find("ns:position", ns).text)
-            quantity = float(point.find("ns:quantity", ns).text)
-
-            timestamp = start_time + pd.Timedelta(hours=position - 1)
+    # Per-request TTL on top of the session cache (see CACHE_PATH)
+    expire_after = (
+        PAST_YEAR_EXPIRE_S if year < datetime.now().year else CURRENT_YEAR_EXPIRE_S
+    )
 
-            records.append({
-                "datetime": timestamp,
-                "load_MW": quantity
-            })
+    async with session.get(BASE_URL, params=params, expire_after=expire_after) as response:
+        response.raise_for_status()
+        content = await response.read()
 
-    df = pd.DataFrame(records)
+    timestamps, quantities = parse_entsoe_load_points(content)
 
-    if df.empty:
+    if len(timestamps) == 0:
         raise ValueError("ENTSO-E returned an empty dataset")
-    
+
     # Filter to requested year only
     # The API may return data beyond period_end (forecasts, planned values)
-    df = df[df["datetime"].dt.year == year].copy()
+    year_start = np.datetime64(f"{year}-01-01", "us")
+    year_end = np.datetime64(f"{year + 1}-01-01", "us")
+    in_year = (timestamps >= year_start) & (timestamps < year_end)
 
-    if df.empty:
+    if not in_year.any():
         raise ValueError(f"No data found for year {year} after filtering")
-    
+
     # For the current year, drop future rows (ENTSO-E returns planned/forecast values)
-    today = pd.Timestamp.now(tz="UTC").normalize()
-    df = df[df["datetime"] <= today].copy()
-    if df.empty:
+    today = np.datetime64(datetime.now(timezone.utc).date(), "us")
+    keep = in_year & (timestamps <= today)
+    if not keep.any():
         raise ValueError(f"No data found for year {year} after filtering future rows")
 
-    df = (
-        df.sort_values("datetime")
-          .drop_duplicates(subset=["datetime"])
-          .reset_index(drop=True)
-    )
+    # Sort and drop duplicated timestamps: np.unique returns the index of
+    # each value's first occurrence, so the first one wins
+    timestamps, first = np.unique(timestamps[keep], return_index=True)
+    quantities = quantities[keep][first]
 
-    # Resample to strict hourly frequency
+    # Resample to strict hourly frequency (mean per hour, NaN for missing hours)
     # Handles sub-hourly points introduced by ENTSO-E during DST transitions
-    print(f"[DEBUG] Before resample : {len(df)} lines")
-    df = (
-        df.set_index("datetime")
-          .resample("1h")["load_MW"]
-          .mean()
-          .reset_index()
-    )
-    print(f"[DEBUG] After resample : {len(df)} lines")
+    hours = timestamps.astype("datetime64[h]")
+    bins = (hours - hours[0]).astype(np.int64)
+    n_hours = bins[-1] + 1
 
-    return df
+    counts = np.bincount(bins, minlength=n_hours)
+    sums = np.bincount(bins, weights=quantities, minlength=n_hours)
+    load = np.full(n_hours, np.nan)
+    np.divide(sums, counts, out=load, where=counts > 0)
+
+    return pa.table({
+        "datetime": pa.array(
+            (hours[0] + np.arange(n_hours)).astype("datetime64[us]"),
+            type=pa.timestamp("us", tz="UTC")
+        ),
+        # Demand has at most 5 significant digits (MW): float32 is enough
+        "load_MW": pa.array(load.astype(np.float32))
+    })
 
 
 # ---------------------------------------------------------------------
-# Fetch and store 
+# Fetch and store
 # ---------------------------------------------------------------------
+async def _fetch_and_store_one_year(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    year: int,
+    country: str,
+    country_code: str,
+    api_token: str,
+    output_file: Path
+):
+    """
+    Fetch one year and write it to parquet as soon as it completes.
+    Errors are reported per year so one failure does not cancel the others.
+    """
+
+    async with semaphore:
+        print(f"[FETCH] ENTSO-E demand | {country} | {year}")
+
+        try:
+            table = await fetch_entsoe_demand_one_year(
+                session=session,
+                year=year,
+                country_code=country_code,
+                api_token=api_token
+            )
+
+            table = append_country_column(table, country)
+
+            pq.write_table(
+                table,
+                output_file,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=True,
+                write_statistics=True
+            )
+
+            print(f"[SAVED] {output_file} | rows={table.num_rows}")
+
+        except Exception as e:
+            print(f"[ERROR] {country} {year} → {e}")
+
+
+async def _fetch_and_store_years(
+    country: str,
+    country_code: str,
+    api_token: str,
+    output_files: dict[int, Path]
+):
+    """
+    Fetch all requested years concurrently on a single cached HTTP session.
+    """
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_S)
+
+    # The API token is not part of the request identity
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    cache = SQLiteBackend(cache_name=str(CACHE_PATH), ignored_params=["securityToken"])
+
+    # One pooled keep-alive connection per concurrent request: the TLS
+    # handshake is paid once per connection, not once per year
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_REQUESTS,
+        keepalive_timeout=KEEPALIVE_TIMEOUT_S,
+        ttl_dns_cache=300
+    )
+
+    async with CachedSession(cache=cache, timeout=timeout, connector=connector) as session:
+        await asyncio.gather(*(
+            _fetch_and_store_one_year(
+                session=session,
+                semaphore=semaphore,
+                year=year,
+                country=country,
+                country_code=country_code,
+                api_token=api_token,
+                output_file=output_file
+            )
+            for year, output_file in output_files.items()
+        ))
+
+
 def fetch_entsoe_demand_and_store(
     country: str,
     country_code: str,
@@ -149,6 +240,8 @@ def fetch_entsoe_demand_and_store(
     if not api_token:
         raise ValueError("ENTSOE_API_TOKEN not found in environment")
 
+    output_files = {}
+
     for year in range(start_year, end_year + 1):
 
         # Partioned output folder
@@ -175,25 +268,17 @@ def fetch_entsoe_demand_and_store(
             print(f"[FETCH] {output_file} exists but year={year} is current year - refreshing")
 
         # If we reach this point, it means we need to fetch the data
-        print(f"[FETCH] ENTSO-E demand | {country} | {year}")
+        output_files[year] = output_file
 
-        try:
-            df = fetch_entsoe_demand_one_year(
-                year=year,
-                country_code=country_code,
-                api_token=api_token
-            )
-
-            df["country"] = country
-
-            df.to_parquet(output_file, index=False)
-
-            print(f"[SAVED] {output_file} | rows={len(df)}")
-
-        except Exception as e:
-            print(f"[ERROR] {country} {year} → {e}")
+    if not output_files:
+        return
 
-        time.sleep(random.uniform(0.3, 0.7))
+    asyncio.run(_fetch_and_store_years(
+        country=country,
+        country_code=country_code,
+        api_token=api_token,
+        output_files=output_files
+    ))
 
 
 # ---------------------------------------------------------------------
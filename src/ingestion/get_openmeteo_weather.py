@@ -9,17 +9,24 @@ Output directory (always, regardless of where the script is run):
 data/raw/weather/country=XX/year=YYYY/weather.parquet
 
 Existing files are always overwritten (for the moment).
+
+Each run of consecutive missing years is fetched with a single request
+spanning it, then split by year.
 """
 
 from pathlib import Path
-import time
-import random
-import pandas as pd
+import threading
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests_cache
 from retry_requests import retry
 import openmeteo_requests
 import datetime as datetime
 
+from src.ingestion.arrow_utils import append_country_column
+
 
 # ---------------------------------------------------------------------
 # Project paths 
@@ -29,30 +36,108 @@ DATA_RAW_PATH = PROJECT_ROOT / "data" / "raw" / "weather"
 
 BASE_URL = "https://archive-api.open-meteo.com/v1/archive"
 
+# Persistent HTTP cache, shared by every run whatever the working directory
+CACHE_PATH = PROJECT_ROOT / ".cache" / "openmeteo"
+
+# Written next to a year's parquet file once that year is complete
+DONE_SENTINEL = ".done"
+
+# The archive is published a few days late: ranges ending within this lag
+# may still hold NaN hours, so they are refreshed and only cached briefly
+ARCHIVE_LAG = datetime.timedelta(days=7)
+INCOMPLETE_RANGE_EXPIRE_S = 3600
+
+WEATHER_COLS = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "wind_speed_10m",
+    "shortwave_radiation_instant"
+]
+
+
+# ---------------------------------------------------------------------
+# Open-Meteo client
+# ---------------------------------------------------------------------
+def build_openmeteo_client() -> openmeteo_requests.Client:
+    """
+    Build an Open-Meteo client on a cached + retry-enabled session.
+
+    Built once (see get_openmeteo_client) and reused for every request,
+    so the SQLite cache is opened once and HTTP connections are pooled.
+    """
+
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    cache_session = requests_cache.CachedSession(
+        cache_name=str(CACHE_PATH),
+        backend="sqlite",
+        # Archived weather never changes: responses are kept forever and
+        # still served if the API fails
+        expire_after=-1,
+        stale_if_error=True,
+        allowable_codes=(200,),
+        allowable_methods=("GET",),
+        # The session may be used from another thread than its creator
+        check_same_thread=False
+    )
+    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
+
+    return openmeteo_requests.Client(session=retry_session)
+
+
+# Module-level client, built on first use and shared by every call
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_openmeteo_client() -> openmeteo_requests.Client:
+    """
+    Return the shared Open-Meteo client, building it on first use.
+    """
+
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = build_openmeteo_client()
+
+    return _client
+
 
 # ---------------------------------------------------------------------
-# Fetch one full year of weather data
+# Fetch a date range of weather data
 # ---------------------------------------------------------------------
-def fetch_openmeteo_weather_one_year(
-    year: int,
+def fetch_openmeteo_weather_range(
+    client: openmeteo_requests.Client,
+    start_date: str,
+    end_date: str,
     latitude: float,
-    longitude: float
-) -> pd.DataFrame:
+    longitude: float,
+    refresh: bool = False
+) -> pa.Table:
     """
-    Fetch hourly weather data for one full year from Open-Meteo.
+    Fetch hourly weather data from Open-Meteo for a date range
+    (possibly spanning several years) in a single request.
 
     Parameters
     ----------
-    year : int
-        Year to fetch (e.g. 2023)
+    client : openmeteo_requests.Client
+        Client returned by build_openmeteo_client
+    start_date : str
+        First day to fetch (e.g. "2015-01-01")
+    end_date : str
+        Last day to fetch, inclusive (capped at today)
     latitude : float
         Latitude of the location
     longitude : float
         Longitude of the location
+    refresh : bool, default=False
+        Bypass the cached response (range that may still be incomplete)
+        and cache the new one for INCOMPLETE_RANGE_EXPIRE_S only
 
     Returns
     -------
-    pd.DataFrame
+    pa.Table
         Columns:
         - datetime (UTC)
         - temperature_2m
@@ -61,54 +146,76 @@ def fetch_openmeteo_weather_one_year(
         - shortwave_radiation_instant
     """
 
-    # Setup cached + retry-enabled session
-    cache_session = requests_cache.CachedSession(
-        cache_name=".cache/openmeteo",
-        expire_after=-1
-    )
-    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-    client = openmeteo_requests.Client(session=retry_session)
-
     params = {
         "latitude": latitude,
         "longitude": longitude,
-        "start_date": f"{year}-01-01",
-        "end_date": min(f"{year}-12-31", datetime.date.today().isoformat()),
-        "hourly": [
-            "temperature_2m",
-            "relative_humidity_2m",
-            "wind_speed_10m",
-            "shortwave_radiation_instant"
-        ]
+        "start_date": start_date,
+        "end_date": min(end_date, datetime.date.today().isoformat()),
+        "hourly": WEATHER_COLS
     }
 
-    responses = client.weather_api(BASE_URL, params=params)
+    # Per-request cache options, forwarded to the cached session
+    cache_options = (
+        {"force_refresh": True, "expire_after": INCOMPLETE_RANGE_EXPIRE_S} if refresh else {}
+    )
+
+    responses = client.weather_api(BASE_URL, params=params, **cache_options)
     response = responses[0]
     hourly = response.Hourly()
 
-    df = pd.DataFrame({
-        "datetime": pd.date_range(
-            start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-            end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=hourly.Interval()),
-            inclusive="left"
+    # Arrow columns are built straight from the response arrays (no pandas)
+    table = pa.table({
+        # Epoch seconds [Time, TimeEnd) every Interval
+        "datetime": pa.array(
+            np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64),
+            type=pa.timestamp("s", tz="UTC")
         ),
-        "temperature_2m": hourly.Variables(0).ValuesAsNumpy(),
-        "relative_humidity_2m": hourly.Variables(1).ValuesAsNumpy(),
-        "wind_speed_10m": hourly.Variables(2).ValuesAsNumpy(),
-        "shortwave_radiation_instant": hourly.Variables(3).ValuesAsNumpy()
+        # Variables come back in request order, as float32 arrays
+        **{
+            col: pa.array(
+                np.ascontiguousarray(hourly.Variables(i).ValuesAsNumpy(), dtype=np.float32)
+            )
+            for i, col in enumerate(WEATHER_COLS)
+        }
     })
 
-    if df.empty:
+    if table.num_rows == 0:
         raise ValueError("Open-Meteo returned an empty dataset")
 
-    df = (
-        df.sort_values("datetime")
-          .drop_duplicates(subset=["datetime"])
-          .reset_index(drop=True)
-    )
+    # No sort / de-duplication needed: timestamps come from np.arange,
+    # strictly increasing by construction
+    return table
+
+
+# ---------------------------------------------------------------------
+# Year completeness
+# ---------------------------------------------------------------------
+def _is_year_complete(table: pa.Table, year: int) -> bool:
+    """
+    A year is complete once its last hour is published. Timestamps are
+    generated from the requested range, so they prove nothing: hours the
+    archive has not published yet (a few days of lag) come back as NaN.
+    The last row must therefore be Dec 31 23:00 UTC with every
+    WEATHER_COLS value set.
+    """
 
-    return df
+    if table.num_rows == 0:
+        return False
+
+    last_row = table.slice(table.num_rows - 1)
+    last_timestamp = last_row["datetime"][0].as_py()
+
+    # Files written by older versions may hold naive UTC timestamps
+    if last_timestamp.tzinfo is None:
+        last_timestamp = last_timestamp.replace(tzinfo=datetime.timezone.utc)
+
+    if last_timestamp < datetime.datetime(year, 12, 31, 23, tzinfo=datetime.timezone.utc):
+        return False
+
+    return not any(
+        np.isnan(last_row[col].to_numpy()).any()
+        for col in WEATHER_COLS
+    )
 
 
 # ---------------------------------------------------------------------
@@ -127,6 +234,8 @@ def fetch_openmeteo_weather_and_store(
     Files are always overwritten.
     """
 
+    output_paths = {}
+
     for year in range(start_year, end_year + 1):
 
         output_dir = (
@@ -141,37 +250,95 @@ def fetch_openmeteo_weather_and_store(
         # Final output file path
         output_path = output_dir / "weather.parquet"
 
-        # If the file already exists, we skip fetching 
+        # If the year is complete on disk, we skip fetching 
         current_year = datetime.date.today().year  # datetime est importé comme "import datetime as datetime"
 
-        if output_path.exists() and year < current_year:
+        done_path = output_dir / DONE_SENTINEL
+
+        # Files written before the sentinel existed are marked from their content
+        if year < current_year and output_path.exists() and not done_path.exists():
+            stored = pq.ParquetFile(output_path).read(columns=["datetime", *WEATHER_COLS])
+            if _is_year_complete(stored, year):
+                done_path.touch()
+
+        if done_path.exists() and year < current_year:
             print(f"[SKIP] {output_path} already exists")
             continue
 
+        if output_path.exists() and year < current_year:
+            print(f"[FETCH] {output_path} exists but is not marked complete — refreshing")
+
         if output_path.exists() and year == current_year:
             print(f"[FETCH] {output_path} exists but year={year} is current year — refreshing")
 
-        print(f"[FETCH] Open-Meteo weather | {country} | {year}")
+        # If we reach this point, it means we need to fetch the data
+        output_paths[year] = output_path
+
+    # Consecutive missing years are grouped into runs, one request per run,
+    # so completed years in between are never refetched
+    runs = []
+    for year in output_paths:
+        if runs and year == runs[-1][-1] + 1:
+            runs[-1].append(year)
+        else:
+            runs.append([year])
+
+    # Years still within the publication lag may not be complete yet
+    lag_year = (datetime.date.today() - ARCHIVE_LAG).year
+
+    for run in runs:
+
+        first_year, last_year = run[0], run[-1]
+        print(f"[FETCH] Open-Meteo weather | {country} | {first_year}-{last_year}")
+
+        # A year stored but not marked complete, or within the lag, must not
+        # be replayed from the cache (the cached response may be incomplete)
+        refresh = last_year >= lag_year or any(output_paths[year].exists() for year in run)
 
         try:
-            df = fetch_openmeteo_weather_one_year(
-                year=year,
+            table = fetch_openmeteo_weather_range(
+                client=get_openmeteo_client(),
+                start_date=f"{first_year}-01-01",
+                end_date=f"{last_year}-12-31",
                 latitude=latitude,
-                longitude=longitude
+                longitude=longitude,
+                refresh=refresh
             )
+        except Exception as e:
+            # A failed run does not prevent the other runs from being fetched
+            print(f"[ERROR] {country} {first_year}-{last_year} → {e}")
+            continue
 
-            df["country"] = country
+        table = append_country_column(table, country)
 
-            df.to_parquet(output_path, index=False)
+        # Each year is a filtered slice of the same table
+        row_years = pc.year(table["datetime"])
 
-            print(
-                f"[SAVED] {output_path} | rows={len(df)}"
+        for year in run:
+
+            output_path = output_paths[year]
+            table_year = table.filter(pc.equal(row_years, year))
+
+            if table_year.num_rows == 0:
+                print(f"[ERROR] {country} {year} → Open-Meteo returned no data for this year")
+                continue
+
+            # One row group per year of hourly data
+            pq.write_table(
+                table_year,
+                output_path,
+                compression="zstd",
+                compression_level=3,
+                row_group_size=8760,
+                use_dictionary=["country"]
             )
 
-        except Exception as e:
-            print(f"[ERROR] {country} {year} → {e}")
+            print(
+                f"[SAVED] {output_path} | rows={table_year.num_rows}"
+            )
 
-        time.sleep(random.uniform(0.2, 0.5))
+            if _is_year_complete(table_year, year):
+                (output_path.parent / DONE_SENTINEL).touch()
 
 
 # ---------------------------------------------------------------------
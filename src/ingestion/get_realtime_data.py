@@ -25,13 +25,15 @@ from datetime import datetime, timezone, timedelta
 import os
 import time
 import requests
+import numpy as np
 import pandas as pd
-import xml.etree.ElementTree as ET
 import requests_cache
 import openmeteo_requests
 from retry_requests import retry
 from dotenv import load_dotenv
 
+from src.ingestion.entsoe_xml import EntsoeNoDataError, parse_entsoe_load_xml
+
 
 # ---------------------------------------------------------------------
 # Project paths
@@ -101,28 +103,13 @@ def fetch_entsoe_realtime(
 
     response.raise_for_status()
 
-    root = ET.fromstring(response.content)
-    ns = {"ns": "urn:iec62325.351:tc57wg16:451-6:generationloaddocument:3:0"}
-
-    period_nodes = root.findall(".//ns:Period", ns)
-    if not period_nodes:
-        raise ValueError(
+    try:
+        df = parse_entsoe_load_xml(response.content)
+    except EntsoeNoDataError as e:
+        raise EntsoeNoDataError(
             "No <Period> nodes found in ENTSO-E response. "
             "The data may not be published yet for this time window."
-        )
-
-    records = []
-    for period in period_nodes:
-        start_str = period.find("ns:timeInterval/ns:start", ns).text
-        start_time = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-
-        for point in period.findall("ns:Point", ns):
-            position = int(point.find("ns:position", ns).text)
-            quantity = float(point.find("ns:quantity", ns).text)
-            timestamp = start_time + pd.Timedelta(hours=position - 1)
-            records.append({"datetime": timestamp, "load_MW": quantity})
-
-    df = pd.DataFrame(records)
+        ) from e
 
     if df.empty:
         raise ValueError("ENTSO-E returned an empty dataset for the requested window.")
@@ -206,27 +193,21 @@ def fetch_openmeteo_realtime(
     hourly = response.Hourly()
 
     df = pd.DataFrame({
-        "datetime": pd.date_range(
-            start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-            end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=hourly.Interval()),
-            inclusive="left",
+        # Built with np.arange: already sorted and unique
+        "datetime": pd.DatetimeIndex(
+            np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64)
+              .view("datetime64[s]"),
+            tz="UTC"
         ),
-        "temperature_2m": hourly.Variables(0).ValuesAsNumpy(),
-        "relative_humidity_2m": hourly.Variables(1).ValuesAsNumpy(),
-        "wind_speed_10m": hourly.Variables(2).ValuesAsNumpy(),
-        "shortwave_radiation_instant": hourly.Variables(3).ValuesAsNumpy(),
+        "temperature_2m": np.ascontiguousarray(hourly.Variables(0).ValuesAsNumpy(), dtype=np.float32),
+        "relative_humidity_2m": np.ascontiguousarray(hourly.Variables(1).ValuesAsNumpy(), dtype=np.float32),
+        "wind_speed_10m": np.ascontiguousarray(hourly.Variables(2).ValuesAsNumpy(), dtype=np.float32),
+        "shortwave_radiation_instant": np.ascontiguousarray(hourly.Variables(3).ValuesAsNumpy(), dtype=np.float32),
     })
 
     if df.empty:
         raise ValueError("Open-Meteo returned an empty forecast.")
 
-    df = (
-        df.sort_values("datetime")
-          .drop_duplicates(subset=["datetime"])
-          .reset_index(drop=True)
-    )
-
     print(f"[OPENMETEO] Fetched {len(df)} forecast rows")
     return df
 
@@ -16,6 +16,8 @@ import pickle
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.modeling.config import COUNTRY, FEATURE_COLS, TARGET_COL, TRAIN_END, VAL_END
 
@@ -48,7 +50,8 @@ def load_features(country: str, years: list[int]) -> pd.DataFrame:
     pd.DataFrame
         Sorted by datetime, indexed by datetime (UTC-aware).
     """
-    dfs = []
+    # Years are kept as Arrow tables and converted to pandas only once
+    tables = []
 
     for year in years:
         path = (
@@ -58,18 +61,21 @@ def load_features(country: str, years: list[int]) -> pd.DataFrame:
             / "load_forecasting_features.parquet"
         )
         if path.exists():
-            dfs.append(pd.read_parquet(path))
+            tables.append(pq.read_table(path, partitioning=None))
         else:
             print(f"[WARN] Missing features for {country} {year} — skipping")
 
-    if not dfs:
+    if not tables:
         raise ValueError(
             f"No feature files found for {country} {years}. "
             "Run the feature engineering step first."
         )
 
+    # Permissive promotion: older years may be stored with wider dtypes
+    table = pa.concat_tables(tables, promote_options="permissive")
+
     df = (
-        pd.concat(dfs, ignore_index=True)
+        table.to_pandas(self_destruct=True, split_blocks=True)
           .sort_values("datetime")
           .set_index("datetime")
     )
@@ -1,16 +1,19 @@
 """
-Builds hourly, clean, and ML-ready datasets by preprocessing and merging
+Builds hourly, clean, and ML-ready datasets by preprocessing and aligning
 electricity demand and weather time series data.
 
 For each country and year, the module:
 - Loads raw Parquet datasets
-- Reindexes data on a full hourly datetime index
+- Reindexes both sources on one shared hourly datetime index
 - Interpolates missing numeric values
-- Merges demand and weather features
+- Keeps the hours covered by both demand and weather
 - Applies basic data quality checks
 - Saves the processed dataset to data/processed
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -19,6 +22,14 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_BASE_PATH = PROJECT_ROOT / "data" / "raw"
 PROCESSED_BASE_PATH = PROJECT_ROOT / "data" / "processed"
 
+# Weather columns: interpolated, or forward filled (radiation)
+WEATHER_COLS = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "wind_speed_10m",
+]
+WEATHER_FFILL_COLS = ["shortwave_radiation_instant"]
+
 
 # ---------------------------------------------------------------------
 # Build full hourly datetime index
@@ -30,6 +41,46 @@ def build_full_hourly_index(df: pd.DataFrame, time_col: str) -> pd.DatetimeIndex
         freq="h"
     )
 
+# ---------------------------------------------------------------------
+# Linear interpolation on a regular grid
+# ---------------------------------------------------------------------
+def _interpolate_linear(values: np.ndarray, limit: int | None = None) -> np.ndarray:
+    """
+    Fill interior NaNs of regularly sampled series by linear interpolation.
+
+    values is a single series or a (n_points, n_series) matrix, filled in
+    one pass: columns are laid end to end and only the NaN points are
+    computed, from the valid points on each side of their gap.
+
+    On a full hourly index this matches interpolate(method="time",
+    limit_area="inside"): leading and trailing NaNs are left untouched.
+    If limit is set, gaps longer than limit points are left as NaN.
+    """
+    n_points = values.shape[0]
+    flat = values.reshape(-1, order="F")
+
+    is_nan = np.isnan(flat)
+    missing = np.flatnonzero(is_nan)
+    valid = np.flatnonzero(~is_nan)
+    if len(missing) == 0 or len(valid) == 0:
+        return values
+
+    # Valid points surrounding each missing point
+    right = np.searchsorted(valid, missing)
+    has_both = (right > 0) & (right < len(valid))
+    missing, right = missing[has_both], right[has_both]
+    lo, hi = valid[right - 1], valid[right]
+
+    # Interior gaps only: both ends must belong to the same series
+    fill = lo // n_points == hi // n_points
+    if limit is not None:
+        fill &= hi - lo - 1 <= limit
+    missing, lo, hi = missing[fill], lo[fill], hi[fill]
+
+    out = flat.copy()
+    out[missing] = flat[lo] + (missing - lo) / (hi - lo) * (flat[hi] - flat[lo])
+    return out.reshape(values.shape, order="F")
+
 # ---------------------------------------------------------------------
 # Reindex and interpolate time series data
 # ---------------------------------------------------------------------
@@ -39,18 +90,22 @@ def reindex_and_interpolate_ts(
     numeric_cols: list[str],
     ffill_cols: list[str] | None = None,
     categorical_cols: list[str] | None = None,
+    limit: int | None = None,
+    full_index: pd.DatetimeIndex | None = None,
 ) -> pd.DataFrame:
 
-    df = (
-        df
-        .drop_duplicates(subset=time_col)
-        .sort_values(time_col)
-        .copy()
-    )
+    # Raw parquet files already store datetimes: only parse other inputs
+    if not pd.api.types.is_datetime64_any_dtype(df[time_col]):
+        df = df.assign(**{time_col: pd.to_datetime(df[time_col])})
 
-    df[time_col] = pd.to_datetime(df[time_col])
+    # Sort and drop duplicated timestamps (first occurrence wins) in a
+    # single np.unique pass over the int64 timestamps
+    _, first = np.unique(pd.DatetimeIndex(df[time_col]).asi8, return_index=True)
+    df = df.iloc[first]
 
-    full_index = build_full_hourly_index(df, time_col)
+    # Default grid: the hourly range covered by the data itself
+    if full_index is None:
+        full_index = build_full_hourly_index(df, time_col)
 
     df = (
         df
@@ -58,10 +113,12 @@ def reindex_and_interpolate_ts(
         .reindex(full_index)
     )
 
-    df[numeric_cols] = (
-        df[numeric_cols]
-        .interpolate(method="time", limit_area="inside")
-    )
+    # Regular hourly grid: time interpolation is plain linear interpolation,
+    # skipped entirely when the reindexed columns have no gap
+    if numeric_cols:
+        values = df[numeric_cols].to_numpy()
+        if np.isnan(values).any():
+            df[numeric_cols] = _interpolate_linear(values, limit=limit)
 
     if ffill_cols:
         df[ffill_cols] = df[ffill_cols].ffill()
@@ -113,54 +170,88 @@ def build_processed_dataset_for_country_year(country: str, year: int):
     df_demand = pd.read_parquet(demand_path)
     df_weather = pd.read_parquet(weather_path)
 
+    # Interpolate in float32, the precision weather is stored in
+    df_weather = df_weather.astype(
+        {col: np.float32 for col in WEATHER_COLS + WEATHER_FFILL_COLS}
+    )
+
+    # ---------------- Shared hourly grid ----------------
+    # Both sources are reindexed on one grid spanning them both, then
+    # trimmed to the hours they share (the rows of an inner join on
+    # datetime). Spanning both keeps each source's interpolation and
+    # fills identical to reindexing it on its own range
+    demand_time = df_demand["datetime"]
+    weather_time = df_weather["datetime"]
+
+    full_index = pd.date_range(
+        start=min(demand_time.min(), weather_time.min()),
+        end=max(demand_time.max(), weather_time.max()),
+        freq="h"
+    ).as_unit(demand_time.dt.unit)
+
+    shared = slice(
+        full_index.searchsorted(max(demand_time.min(), weather_time.min())),
+        full_index.searchsorted(min(demand_time.max(), weather_time.max()), side="right")
+    )
+
     # ---------------- Demand ----------------
     df_demand = reindex_and_interpolate_ts(
         df=df_demand,
         time_col="datetime",
         numeric_cols=["load_MW"],
-        categorical_cols=["country"]
+        categorical_cols=["country"],
+        full_index=full_index
     )
 
     # ---------------- Weather ----------------
-    weather_cols = [
-        "temperature_2m",
-        "relative_humidity_2m",
-        "wind_speed_10m",
-    ]
-
-    weather_ffill_cols = ["shortwave_radiation_instant"]
-
     df_weather = reindex_and_interpolate_ts(
         df=df_weather,
         time_col="datetime",
-        numeric_cols=weather_cols,
-        ffill_cols=weather_ffill_cols
+        numeric_cols=WEATHER_COLS,
+        ffill_cols=WEATHER_FFILL_COLS,
+        full_index=full_index
     )
 
-    # Weather: drop redundant metadata (single-country pipeline)
-    df_weather = df_weather.drop(columns=["country"], errors="ignore")
+    # ---------------- Assemble ----------------
+    # Same grid for both sources: the shared hours are the same slice of
+    # each, and the dataset is assembled column by column from arrays.
+    # Single-country pipeline: country is checked on the demand rows, then
+    # stored as all-zero codes into a one-entry category
+    # (weather country metadata is redundant and not kept)
+    countries = df_demand["country"].iloc[shared].dropna().unique()
 
-    # ---------------- Merge ----------------
-    df_processed = df_demand.merge(
-        df_weather,
-        on="datetime",
-        how="inner"
-    )
+    if len(countries) != 1:
+        raise ValueError(
+            f"[{country} {year}] Multiple countries detected in processed data : "
+            f"{countries}"
+        )
 
-    df_processed["year"] = year
+    shared_index = full_index[shared]
+
+    df_processed = pd.DataFrame({
+        "datetime": shared_index,
+        "load_MW": df_demand["load_MW"].to_numpy(dtype=np.float32)[shared],
+        "country": pd.Categorical.from_codes(
+            np.zeros(len(shared_index), dtype=np.int8),
+            categories=[countries[0]]
+        ),
+        **{
+            col: df_weather[col].to_numpy(dtype=np.float32)[shared]
+            for col in WEATHER_COLS + WEATHER_FFILL_COLS
+        },
+        "year": year,
+    })
 
     # ---------------- Final checks ----------------
-    if df_processed.isna().sum().sum() != 0:
+    # Rows are on a regular hourly grid by construction (full hourly
+    # reindex, then aligned on shared timestamps): only NaNs are checked,
+    # counted once per column
+    nan_counts = df_processed.isna().sum()
+    if nan_counts.any():
         raise ValueError(
             f"[{country} {year}] NaNs detected after preprocessing : "
-            f"{df_processed.isna().sum().sum()} NaNs\n"
-            f"{df_processed.isna().sum()[df_processed.isna().sum() > 0]}"
-        )
-
-    if df_processed["country"].nunique() != 1:
-        raise ValueError(
-            f"[{country} {year}] Multiple countries detected in processed data : "
-            f"{df_processed['country'].unique()}"
+            f"{nan_counts.sum()} NaNs\n"
+            f"{nan_counts[nan_counts > 0]}"
         )
 
     # ---------------- Save ----------------
@@ -172,15 +263,42 @@ def build_processed_dataset_for_country_year(country: str, year: int):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     output_path = output_dir / "load_weather.parquet"
-    df_processed.to_parquet(output_path, index=False)
+
+    # One row group per year of hourly data, country dictionary-encoded
+    df_processed.to_parquet(
+        output_path,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        row_group_size=8760,
+        use_dictionary=["country"]
+    )
 
     print(f"[SAVED] {output_path}")
 
 
 def build_processed_dataset(countries: list[str], years: list[int]):
-    for country in countries:
-        for year in years:
+    # Each (country, year) is an independent read → interpolate → write job
+    jobs = [(country, year) for country in countries for year in years]
+    if not jobs:
+        return
+
+    max_workers = min(os.cpu_count() or 1, len(jobs))
+
+    # No pool for a single worker: spawning a process would only add overhead
+    if max_workers == 1:
+        for country, year in jobs:
             build_processed_dataset_for_country_year(country, year)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # list() surfaces the first exception raised by a worker
+        list(executor.map(
+            build_processed_dataset_for_country_year,
+            [country for country, _ in jobs],
+            [year for _, year in jobs]
+        ))
 
 # ---------------------------------------------------------------------
 # Command line execution
@@ -1,11 +1,19 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.feature_engineering.build_features import _compute_features
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.feature_engineering.build_features import (
+    _compute_features,
+    _holiday_days,
+    build_load_forecasting_features,
+)
 
 
 # -----------------------------------------------------------------------
-# Helper
+# Helpers
 # -----------------------------------------------------------------------
 def make_continuous_df(n_hours: int = 200) -> pd.DataFrame:
     """
@@ -21,6 +29,38 @@ def make_continuous_df(n_hours: int = 200) -> pd.DataFrame:
     })
 
 
+def make_hourly_df(start: str, end: str) -> pd.DataFrame:
+    """Build a one-row-per-hour DataFrame over [start, end] (UTC)."""
+    datetimes = pd.date_range(start, end, freq="h", tz="UTC")
+    return pd.DataFrame({
+        "datetime": datetimes,
+        "load_MW": np.full(len(datetimes), 50000.0),
+        "temperature_2m": np.full(len(datetimes), 5.0),
+    })
+
+
+def write_processed_year(base: Path, year: int, old_format: bool = False) -> None:
+    """
+    Write one year of processed data, load_MW = hours since 2023-01-01.
+    old_format mimics files written before the float32 / categorical
+    storage (float64 values, plain string country), such as the previous
+    year downloaded by the CI workflow.
+    """
+    datetimes = pd.date_range(f"{year}-01-01", f"{year}-12-31 23:00", freq="h", tz="UTC")
+    hours = (datetimes - pd.Timestamp("2023-01-01", tz="UTC")) // pd.Timedelta(hours=1)
+    dtype = np.float64 if old_format else np.float32
+    df = pd.DataFrame({
+        "datetime": datetimes.as_unit("ns" if old_format else "us"),
+        "load_MW": np.asarray(hours, dtype=dtype),
+        "country": pd.Series(["FR"] * len(datetimes), dtype=object if old_format else "category"),
+        "temperature_2m": np.full(len(datetimes), 10.0, dtype=dtype),
+        "year": year,
+    })
+    output_dir = base / "country=FR" / f"year={year}"
+    output_dir.mkdir(parents=True)
+    df.to_parquet(output_dir / "load_weather.parquet", index=False)
+
+
 # -----------------------------------------------------------------------
 # Tests
 # -----------------------------------------------------------------------
@@ -102,4 +142,103 @@ def test_last_row_has_no_target():
     df = make_continuous_df(n_hours=10)
     result = _compute_features(df, country="FR")
     assert pd.isna(result["target_load_t+1"].iloc[-1]), \
-        "Last row should have NaN target (no future hour available)"
\ No newline at end of file
+        "Last row should have NaN target (no future hour available)"
+
+
+# -----------------------------------------------------------------------
+# Tests: calendar / holidays
+# -----------------------------------------------------------------------
+def test_calendar_features_match_pandas():
+    """
+    hour, day_of_week (Monday=0) and week_of_year must match pandas'
+    ISO calendar (UTC), with ISO week 53 replaced by 52.
+    Covers 2020-W53 (ending on 2021-01-03), 2024-12-30 which belongs
+    to 2025-W01, and the hours around both 2024 DST transitions.
+    """
+    df = pd.concat([
+        make_hourly_df("2020-12-26", "2021-01-05"),
+        make_hourly_df("2024-03-30 20:00", "2024-03-31 05:00"),
+        make_hourly_df("2024-10-26 20:00", "2024-10-27 05:00"),
+        make_hourly_df("2024-12-28", "2025-01-02"),
+    ], ignore_index=True)
+    result = _compute_features(df, country="FR")
+
+    iso = pd.DatetimeIndex(result["datetime"]).isocalendar()
+    assert (result["hour"].to_numpy() == result["datetime"].dt.hour.to_numpy()).all()
+    assert (result["day_of_week"].to_numpy() == result["datetime"].dt.dayofweek.to_numpy()).all()
+    assert (result["week_of_year"].to_numpy() == np.minimum(iso["week"].to_numpy(), 52)).all()
+
+    # Spot checks on the edge cases themselves
+    by_time = result.set_index("datetime")
+    assert by_time.loc[pd.Timestamp("2021-01-03 12:00", tz="UTC"), "week_of_year"] == 52, \
+        "2020-W53 should be clamped to 52"
+    assert by_time.loc[pd.Timestamp("2024-12-30 12:00", tz="UTC"), "week_of_year"] == 1, \
+        "2024-12-30 belongs to ISO week 1 of 2025"
+    assert by_time.loc[pd.Timestamp("2024-12-30 12:00", tz="UTC"), "day_of_week"] == 0, \
+        "2024-12-30 is a Monday"
+
+
+def test_french_holidays_use_paris_local_days():
+    """
+    14 July and 25 December must give is_holiday=1 and is_weekday=0 over
+    their Europe/Paris local day, which starts at 22:00 / 23:00 UTC the
+    day before (summer / winter time), and not after it ends.
+    """
+    df = pd.concat([
+        make_hourly_df("2025-07-13 20:00", "2025-07-15 00:00"),
+        make_hourly_df("2025-12-24 21:00", "2025-12-26 01:00"),
+    ], ignore_index=True)
+    result = _compute_features(df, country="FR").set_index("datetime")
+
+    def flags(timestamp: str) -> tuple[int, int]:
+        row = result.loc[pd.Timestamp(timestamp, tz="UTC")]
+        return row["is_holiday"], row["is_weekday"]
+
+    assert flags("2025-07-13 21:00") == (0, 0), "Sunday 13 July, 23:00 in Paris"
+    assert flags("2025-07-13 22:00") == (1, 0), "14 July starts at 22:00 UTC"
+    assert flags("2025-07-14 21:00") == (1, 0), "14 July (Monday), 23:00 in Paris"
+    assert flags("2025-07-14 22:00") == (0, 1), "15 July, 00:00 in Paris"
+    assert flags("2025-12-24 22:00") == (0, 1), "24 December, 23:00 in Paris"
+    assert flags("2025-12-24 23:00") == (1, 0), "25 December starts at 23:00 UTC"
+    assert flags("2025-12-25 22:00") == (1, 0), "25 December (Thursday), 23:00 in Paris"
+    assert flags("2025-12-25 23:00") == (0, 1), "26 December, 00:00 in Paris"
+
+    # The holiday table is cached and shared: it must be read-only
+    days = _holiday_days("FR", 2025, 2025)
+    assert _holiday_days("FR", 2025, 2025) is days
+    assert not days.flags.writeable
+    assert np.datetime64("2025-07-14").astype(np.int64) in days
+
+
+# -----------------------------------------------------------------------
+# Tests: build_load_forecasting_features
+# -----------------------------------------------------------------------
+def test_previous_year_only_bootstraps_lags():
+    """
+    Running on the last two of three consecutive years must read the first
+    one (old storage format) only as lag context: no duplicated datetimes,
+    load_t-168 continuous across both year boundaries, and only the
+    requested years written.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        processed, featured = Path(tmpdir) / "processed", Path(tmpdir) / "featured"
+        write_processed_year(processed, 2023, old_format=True)
+        write_processed_year(processed, 2024)
+        write_processed_year(processed, 2025)
+
+        with patch("src.feature_engineering.build_features.PROCESSED_BASE_PATH", processed), \
+             patch("src.feature_engineering.build_features.FEATURED_BASE_PATH", featured):
+            build_load_forecasting_features(country="FR", years=[2024, 2025])
+
+        written = sorted(path.name for path in (featured / "country=FR").iterdir())
+        result = pd.concat(
+            pd.read_parquet(featured / "country=FR" / name / "load_forecasting_features.parquet")
+            for name in written
+        ).reset_index(drop=True)
+
+    assert written == ["year=2024", "year=2025"], "only the requested years should be written"
+    assert not result["datetime"].duplicated().any(), "datetimes should not be duplicated"
+    assert result["datetime"].iloc[0] == pd.Timestamp("2024-01-01 00:00", tz="UTC"), \
+        "the previous year should provide enough context for the first hour"
+    assert (result["load_t"] - result["load_t-168"] == 168).all(), \
+        "load_t-168 should be the load 168 hours earlier, across year boundaries"
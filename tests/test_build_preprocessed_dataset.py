@@ -1,7 +1,14 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.preprocessing.build_preprocessed_dataset import reindex_and_interpolate_ts
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.preprocessing.build_preprocessed_dataset import (
+    build_processed_dataset_for_country_year,
+    reindex_and_interpolate_ts,
+)
 
 
 # -----------------------------------------------------------------------
@@ -120,4 +127,147 @@ def test_duplicates_are_removed():
     assert len(result) == 3, "Duplicate timestamp should be removed"
     row_10 = result[result["datetime"] == pd.Timestamp("2026-01-01 10:00")]
     assert row_10["load_MW"].iloc[0] == pytest.approx(50000.0), \
-        "First occurrence should be kept after deduplication"
\ No newline at end of file
+        "First occurrence should be kept after deduplication"
+
+
+def test_edges_are_not_extrapolated():
+    """
+    Only interior gaps are interpolated (limit_area='inside').
+    A leading NaN must stay NaN rather than being filled from the next value.
+    """
+    df = make_weather_with_gap()
+    df.loc[0, "temperature_2m"] = np.nan
+
+    result = reindex_and_interpolate_ts(
+        df=df,
+        time_col="datetime",
+        numeric_cols=["temperature_2m"],
+        ffill_cols=["shortwave_radiation_instant"],
+    )
+
+    assert pd.isna(result["temperature_2m"].iloc[0]), \
+        "Leading NaN should not be extrapolated"
+    row_12 = result[result["datetime"] == pd.Timestamp("2026-01-01 12:00")]
+    assert row_12["temperature_2m"].iloc[0] == pytest.approx(5.0), \
+        "Interior gap at 12:00 should be linearly interpolated between 4.0 and 6.0"
+
+
+def test_gaps_longer_than_limit_are_left_nan():
+    """
+    With limit set, only gaps of at most limit hours are interpolated;
+    longer gaps stay NaN instead of being bridged by a straight line.
+    """
+    df = pd.DataFrame({
+        "datetime": pd.to_datetime([
+            "2026-01-01 10:00", "2026-01-01 11:00",
+            # 12:00 is missing (1h gap)
+            "2026-01-01 13:00",
+            # 14:00 → 17:00 are missing (4h gap)
+            "2026-01-01 18:00",
+        ]),
+        "load_MW": [50000.0, 51000.0, 53000.0, 58000.0],
+    })
+
+    result = reindex_and_interpolate_ts(
+        df=df,
+        time_col="datetime",
+        numeric_cols=["load_MW"],
+        limit=3,
+    )
+
+    row_12 = result[result["datetime"] == pd.Timestamp("2026-01-01 12:00")]
+    assert row_12["load_MW"].iloc[0] == pytest.approx(52000.0), \
+        "A 1h gap is within the limit and should be interpolated"
+    long_gap = result[result["datetime"].between("2026-01-01 14:00", "2026-01-01 17:00")]
+    assert long_gap["load_MW"].isna().all(), \
+        "A 4h gap exceeds the limit and should be left as NaN"
+
+
+# -----------------------------------------------------------------------
+# Tests: build_processed_dataset_for_country_year
+# -----------------------------------------------------------------------
+WEATHER_COLS = ["temperature_2m", "relative_humidity_2m", "wind_speed_10m"]
+
+
+def make_raw_sources() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Demand (stored in us) and weather (stored in ms) whose ranges only
+    partly overlap, each with an interior gap close to the overlap edges.
+    """
+    demand_time = pd.date_range("2026-01-01 00:00", "2026-01-02 23:00", freq="h", tz="UTC")
+    df_demand = pd.DataFrame({
+        "datetime": demand_time.as_unit("us"),
+        "load_MW": 50000.0 + 100.0 * np.arange(len(demand_time)) ** 1.5,
+        "country": "FR",
+    })
+    # Demand misses 06:00 and 07:00, just after the weather starts
+    df_demand = df_demand[~df_demand["datetime"].dt.hour.isin([6, 7]) | (df_demand["datetime"].dt.day == 2)]
+
+    weather_time = pd.date_range("2026-01-01 05:00", "2026-01-03 05:00", freq="h", tz="UTC")
+    rng = np.random.default_rng(0)
+    df_weather = pd.DataFrame({
+        "datetime": weather_time.as_unit("ms"),
+        **{col: rng.uniform(0.0, 50.0, len(weather_time)).astype(np.float32) for col in WEATHER_COLS},
+        "shortwave_radiation_instant": rng.uniform(0.0, 300.0, len(weather_time)).astype(np.float32),
+        "country": "FR",
+    })
+    # Weather misses 06:00 (next to its first row) and the last two
+    # hours shared with demand
+    missing = pd.to_datetime(
+        ["2026-01-01 06:00", "2026-01-02 22:00", "2026-01-02 23:00"], utc=True
+    )
+    df_weather = df_weather[~df_weather["datetime"].isin(missing)]
+
+    return df_demand.reset_index(drop=True), df_weather.reset_index(drop=True)
+
+
+def test_partial_overlap_matches_inner_join():
+    """
+    With partly overlapping sources, the processed rows and values must
+    be those of reindexing each source on its own range and inner-joining
+    them on datetime, whatever the time unit each source is stored in.
+    """
+    df_demand, df_weather = make_raw_sources()
+
+    expected_demand = reindex_and_interpolate_ts(
+        df=df_demand,
+        time_col="datetime",
+        numeric_cols=["load_MW"],
+        categorical_cols=["country"],
+    )
+    expected_weather = reindex_and_interpolate_ts(
+        df=df_weather.drop(columns="country"),
+        time_col="datetime",
+        numeric_cols=WEATHER_COLS,
+        ffill_cols=["shortwave_radiation_instant"],
+    )
+    expected_weather["datetime"] = expected_weather["datetime"].dt.as_unit("us")
+    expected = pd.merge(expected_demand, expected_weather, on="datetime", how="inner")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        raw, processed = Path(tmpdir) / "raw", Path(tmpdir) / "processed"
+        for source, df, name in [
+            ("electricity_demand", df_demand, "demand.parquet"),
+            ("weather", df_weather, "weather.parquet"),
+        ]:
+            source_dir = raw / source / "country=FR" / "year=2026"
+            source_dir.mkdir(parents=True)
+            df.to_parquet(source_dir / name, index=False)
+
+        with patch("src.preprocessing.build_preprocessed_dataset.RAW_BASE_PATH", raw), \
+             patch("src.preprocessing.build_preprocessed_dataset.PROCESSED_BASE_PATH", processed):
+            build_processed_dataset_for_country_year("FR", 2026)
+
+        result = pd.read_parquet(processed / "country=FR" / "year=2026" / "load_weather.parquet")
+
+    assert result["datetime"].tolist() == expected["datetime"].tolist(), \
+        "Processed rows should be the hours shared by both sources"
+    assert result["datetime"].iloc[0] == pd.Timestamp("2026-01-01 05:00", tz="UTC")
+    assert result["datetime"].iloc[-1] == pd.Timestamp("2026-01-02 23:00", tz="UTC")
+    for col in ["load_MW"] + WEATHER_COLS + ["shortwave_radiation_instant"]:
+        np.testing.assert_allclose(
+            result[col].to_numpy(dtype=np.float64),
+            expected[col].to_numpy(dtype=np.float64),
+            rtol=1e-6,
+            err_msg=f"{col} should match the inner join of both sources"
+        )
@@ -0,0 +1,172 @@
+import asyncio
+import pytest
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+from lxml import etree
+
+from src.ingestion.entsoe_xml import ENTSOE_NS, EntsoeNoDataError, parse_entsoe_load_points
+from src.ingestion.get_entsoe_demand import (
+    _fetch_and_store_one_year,
+    fetch_entsoe_demand_one_year,
+)
+
+
+# -----------------------------------------------------------------------
+# Helpers: minimal ENTSO-E document and HTTP session
+# -----------------------------------------------------------------------
+def make_period(start: str, resolution: str, points: dict[int, float]) -> str:
+    """Create a <Period> with the given {position: quantity} points."""
+    body = "".join(
+        f"<Point><position>{position}</position><quantity>{quantity}</quantity></Point>"
+        for position, quantity in points.items()
+    )
+    return (
+        f"<Period><timeInterval><start>{start}</start></timeInterval>"
+        f"<resolution>{resolution}</resolution>{body}</Period>"
+    )
+
+
+def make_document(*periods: str) -> bytes:
+    """Wrap Periods into an Actual Total Load document."""
+    return (
+        f'<GL_MarketDocument xmlns="{ENTSOE_NS}"><TimeSeries>'
+        + "".join(periods)
+        + "</TimeSeries></GL_MarketDocument>"
+    ).encode()
+
+
+# Frozen clock: 2024 is the current year and today is 2024-01-02
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2024, 1, 2, 12, tzinfo=tz)
+
+
+class FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        return self.content
+
+
+class FakeSession:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def get(self, url, params=None, **kwargs):
+        return FakeResponse(self.content)
+
+
+DOCUMENT = make_document(
+    # Hourly, starts in the previous year, position 4 (01:00) is missing
+    make_period("2023-12-31T22:00Z", "PT60M", {1: 1.0, 2: 2.0, 3: 100.0, 5: 200.0}),
+    # 15-min points for 03:00, averaged to one hourly value
+    make_period("2024-01-01T03:00Z", "PT15M", {1: 10.0, 2: 20.0, 3: 30.0, 4: 40.0}),
+    # Duplicate of 02:00: the first occurrence must win
+    make_period("2024-01-01T02:00Z", "PT60M", {1: 999.0}),
+    # Runs past today: rows after 2024-01-02 00:00 are planned values
+    make_period("2024-01-01T23:00Z", "PT60M", {1: 300.0, 2: 400.0, 3: 500.0}),
+)
+
+
+def fetch_document() -> pa.Table:
+    with patch("src.ingestion.get_entsoe_demand.datetime", FrozenDatetime):
+        return asyncio.run(fetch_entsoe_demand_one_year(
+            session=FakeSession(DOCUMENT),
+            year=2024,
+            country_code="10YFR-RTE------C",
+            api_token="token"
+        ))
+
+
+# -----------------------------------------------------------------------
+# Tests: fetch_entsoe_demand_one_year
+# -----------------------------------------------------------------------
+def test_rows_outside_year_and_future_rows_are_dropped():
+    """
+    Only hours of the requested year up to today (00:00) must be kept,
+    on a strict hourly grid.
+    """
+    table = fetch_document()
+    datetimes = table["datetime"].to_pylist()
+
+    assert table.schema.field("datetime").type == pa.timestamp("us", tz="UTC")
+    assert datetimes[0] == datetime(2024, 1, 1, 0, tzinfo=timezone.utc)
+    assert datetimes[-1] == datetime(2024, 1, 2, 0, tzinfo=timezone.utc)
+    assert len(datetimes) == 25, "one row per hour from 00:00 to the next day 00:00"
+
+
+def test_duplicates_gaps_and_sub_hourly_points():
+    """
+    Duplicated timestamps keep their first value, missing positions
+    become NaN hours and 15-min points are averaged per hour.
+    """
+    load = fetch_document()["load_MW"].to_numpy()
+
+    assert load.dtype == np.float32
+    assert load[0] == 100.0
+    assert np.isnan(load[1]), "missing position 4 should leave 01:00 empty"
+    assert load[2] == 200.0, "first occurrence of 02:00 should win over the duplicate"
+    assert load[3] == 25.0, "15-min points should be averaged over the hour"
+    assert np.isnan(load[4:23]).all()
+    assert load[23] == 300.0
+    assert load[24] == 400.0
+
+
+# -----------------------------------------------------------------------
+# Tests: _fetch_and_store_one_year
+# -----------------------------------------------------------------------
+def test_stored_file_has_dictionary_country_column():
+    """
+    The stored file must hold the fetched rows and a dictionary-encoded
+    country column.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = Path(tmpdir) / "demand.parquet"
+
+        with patch("src.ingestion.get_entsoe_demand.datetime", FrozenDatetime):
+            asyncio.run(_fetch_and_store_one_year(
+                session=FakeSession(DOCUMENT),
+                semaphore=asyncio.Semaphore(1),
+                year=2024,
+                country="FR",
+                country_code="10YFR-RTE------C",
+                api_token="token",
+                output_file=output_file
+            ))
+
+        table = pq.ParquetFile(output_file).read()
+
+    assert table.num_rows == 25
+    assert pa.types.is_dictionary(table.schema.field("country").type)
+    assert set(table["country"].to_pylist()) == {"FR"}
+
+
+# -----------------------------------------------------------------------
+# Tests: parse_entsoe_load_points
+# -----------------------------------------------------------------------
+def test_document_without_period_raises_no_data_error():
+    """
+    A document without <Period> must raise EntsoeNoDataError, while
+    malformed content keeps its own parse error.
+    """
+    with pytest.raises(EntsoeNoDataError):
+        parse_entsoe_load_points(make_document())
+
+    with pytest.raises(etree.XMLSyntaxError):
+        parse_entsoe_load_points(b"<GL_MarketDocument>")
@@ -0,0 +1,116 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.ingestion.get_openmeteo_weather import (
+    DONE_SENTINEL,
+    WEATHER_COLS,
+    fetch_openmeteo_weather_and_store,
+)
+
+
+# -----------------------------------------------------------------------
+# Helpers: build minimal weather tables
+# -----------------------------------------------------------------------
+def make_weather_table(start: str, end: str, nan_from: str | None = None) -> pa.Table:
+    """
+    Create an hourly weather table covering [start, end). Hours from
+    nan_from on hold NaN, like the archive's not yet published hours.
+    """
+    hours = np.arange(np.datetime64(start, "h"), np.datetime64(end, "h"))
+    values = np.ones(len(hours), dtype=np.float32)
+    if nan_from is not None:
+        values[hours >= np.datetime64(nan_from, "h")] = np.nan
+    return pa.table({
+        "datetime": pa.array(hours.astype("datetime64[s]"), type=pa.timestamp("s", tz="UTC")),
+        **{col: pa.array(values) for col in WEATHER_COLS},
+    })
+
+
+def write_year(base: Path, year: int, table: pa.Table) -> Path:
+    """Write a weather file the way it was stored before the sentinel existed."""
+    output_dir = base / "country=FR" / f"year={year}"
+    output_dir.mkdir(parents=True)
+    pq.write_table(table, output_dir / "weather.parquet")
+    return output_dir
+
+
+# -----------------------------------------------------------------------
+# Tests: fetch_openmeteo_weather_and_store
+# -----------------------------------------------------------------------
+def test_existing_unmarked_files_are_migrated():
+    """
+    A past-year file written before the .done sentinel existed must be
+    marked complete when its last hour holds values, and not refetched.
+    A file whose last days are NaN (publication lag) must be refetched,
+    bypassing the cache, and only marked once the refetched data is complete.
+    """
+    calls = []
+    responses = [
+        # The archive still lags: the refetched year has a NaN tail again
+        make_weather_table("2016-01-01", "2017-01-01", nan_from="2016-12-29"),
+        make_weather_table("2016-01-01", "2017-01-01"),
+    ]
+
+    def fake_fetch(client, start_date, end_date, latitude, longitude, refresh=False):
+        calls.append((start_date, end_date, refresh))
+        return responses.pop(0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir)
+        complete_dir = write_year(base, 2015, make_weather_table("2015-01-01", "2016-01-01"))
+        lagging_dir = write_year(
+            base, 2016, make_weather_table("2016-01-01", "2017-01-01", nan_from="2016-12-28")
+        )
+
+        with patch("src.ingestion.get_openmeteo_weather.DATA_RAW_PATH", base), \
+             patch("src.ingestion.get_openmeteo_weather.get_openmeteo_client", return_value=None), \
+             patch("src.ingestion.get_openmeteo_weather.fetch_openmeteo_weather_range", side_effect=fake_fetch):
+            fetch_openmeteo_weather_and_store("FR", 48.85, 2.35, 2015, 2016)
+
+            assert (complete_dir / DONE_SENTINEL).exists(), "complete year should be marked done"
+            assert not (lagging_dir / DONE_SENTINEL).exists(), \
+                "a year ending with NaN hours should not be marked done"
+            assert calls == [("2016-01-01", "2016-12-31", True)], \
+                "only the lagging year should be refetched, bypassing the cache"
+
+            fetch_openmeteo_weather_and_store("FR", 48.85, 2.35, 2015, 2016)
+
+        assert calls[1:] == [("2016-01-01", "2016-12-31", True)]
+        refetched = pq.ParquetFile(lagging_dir / "weather.parquet").read()
+        assert refetched.num_rows == 366 * 24
+        assert not np.isnan(refetched["temperature_2m"].to_numpy()).any()
+        assert (lagging_dir / DONE_SENTINEL).exists(), "refetched complete year should be marked done"
+
+
+def test_missing_years_are_fetched_by_contiguous_run():
+    """
+    Missing years separated by a completed year must be fetched as separate
+    runs, so the completed year is not refetched and a failing run does not
+    prevent the next one from being stored.
+    """
+    calls = []
+
+    def fake_fetch(client, start_date, end_date, latitude, longitude, refresh=False):
+        calls.append((start_date, end_date))
+        if start_date.startswith("2015"):
+            raise ConnectionError("API unavailable")
+        return make_weather_table(start_date, "2018-01-01")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir)
+        done_dir = write_year(base, 2016, make_weather_table("2016-01-01", "2017-01-01"))
+        (done_dir / DONE_SENTINEL).touch()
+
+        with patch("src.ingestion.get_openmeteo_weather.DATA_RAW_PATH", base), \
+             patch("src.ingestion.get_openmeteo_weather.get_openmeteo_client", return_value=None), \
+             patch("src.ingestion.get_openmeteo_weather.fetch_openmeteo_weather_range", side_effect=fake_fetch):
+            fetch_openmeteo_weather_and_store("FR", 48.85, 2.35, 2015, 2017)
+
+        assert calls == [("2015-01-01", "2015-12-31"), ("2017-01-01", "2017-12-31")]
+        assert not (base / "country=FR" / "year=2015" / "weather.parquet").exists()
+        assert (base / "country=FR" / "year=2017" / DONE_SENTINEL).exists(), \
+            "the run after a failed one should still be stored"